@@ -9,12 +9,14 @@ from calc_lang import *
 def main():
     print("Welcome to the Calc Interpreter!")
     print("Enter your commands or ':done' to exit")
+    # every line is split into this same buffer of tokens
+    tokens: Tokens = Tokens()
     # loop until the command :done is found
     while True:
         s: str = input('> ')
         if s.strip() == ':done': break
         try:
-            x = Command.parse(s).eval()
+            x = Command.parse(s, tokens).eval()
             if x is not None: print(x)
         except CalcParseException as e:
             print(f"Error Parsing {s}")
@@ -1,6 +1,10 @@
 from __future__ import annotations
+import sys
 from abc import ABCMeta, abstractmethod
-from typing import Any, Union
+from array import array
+from types import CodeType
+from weakref import WeakValueDictionary
+from typing import Any, Callable, Iterable, Optional, Union
 
 # create a context where variables stored with set are kept
 context: dict[str,int] = {}
@@ -8,24 +12,85 @@ context: dict[str,int] = {}
 # add a "verbose" flag to print all parse exceptions while debugging
 verbose = False
 
+# tags for the kinds of token, so that parsers compare small ints rather
+# than strings; any token that is none of these is tagged TOK_OTHER
+(TOK_OTHER, TOK_PLUS, TOK_MINUS, TOK_LPAREN, TOK_RPAREN,
+ TOK_SET, TOK_EQ, TOK_NUMBER, TOK_NAME) = range(9)
+_keyword_tags: dict[str,int] = {'+': TOK_PLUS, '-': TOK_MINUS, '(': TOK_LPAREN,
+                                ')': TOK_RPAREN, 'set': TOK_SET, '=': TOK_EQ}
+
+# keep one Name for each variable so every use of it shares the same node;
+# the Names are held weakly, so a Name no parse tree uses is let go
+_names: WeakValueDictionary[str, Name] = WeakValueDictionary()
+
+# globals for running Python code compiled from Expressions; variables are
+# read from context and nothing else (not even builtins) is visible
+_code_globals: dict[str,Any] = {'__builtins__': {}, 'context': context}
+
 # define base classes for Language exceptions for ParsingExceptions
 class CalcException(Exception): pass
 class CalcParseException(CalcException): pass
 class CalcEvalException(CalcException): pass
 
+# define the list of tokens for a line of code, which the parsers share by
+# working on spans tokens[lo:hi] of it rather than on sliced copies
+class Tokens(list[str]):
+    def __init__(self, tokens: Iterable[str] = ()):
+        super().__init__()
+        # tag each token with its kind once, here, instead of in every parser
+        self.tags: array[int] = array('i')
+        # map the index of each ( to the index of its matching ), found in
+        # one pass so that no parser has to scan for it again
+        self.matches: dict[int,int] = {}
+        self.load(tokens)
+    def load(self, tokens: Iterable[str]) -> Tokens:
+        """Replaces the contents with a new line of tokens, reusing the
+        storage of the old line, and returns self"""
+        self.clear()
+        self.extend(tokens)
+        del self.tags[:]
+        self.tags.extend([Tokens.tag(token) for token in self])
+        self.matches.clear()
+        opened: list[int] = []
+        for i,tag in enumerate(self.tags):
+            if tag == TOK_LPAREN: opened.append(i)
+            elif tag == TOK_RPAREN and opened: self.matches[opened.pop()] = i
+        return self
+    @staticmethod
+    def tag(token: str) -> int:
+        """Returns the TOK_ tag for the kind of token"""
+        if token in _keyword_tags: return _keyword_tags[token]
+        if token.isdigit(): return TOK_NUMBER
+        if token.isalpha(): return TOK_NAME
+        return TOK_OTHER
+    def text(self, lo: int, hi: int) -> str:
+        """Returns the span tokens[lo:hi] as a string for error messages"""
+        return ' '.join(self[lo:hi])
+
 # define a base class for Commands
 class Command(metaclass=ABCMeta):
+    __slots__ = ()
     @abstractmethod
     def __init__(self): pass
     @abstractmethod
     def eval(self) -> Union[int,None]: pass
+    @abstractmethod
+    def _key(self) -> tuple:
+        """Returns the values that make up this node of the parse tree"""
+    def __eq__(self, other: Any) -> bool: # Commands are equal with the same parse tree
+        return type(self) is type(other) and self._key() == other._key()
+    def __hash__(self) -> int:
+        return hash((type(self), self._key()))
     @staticmethod
-    def parse(s: str) -> Command:
-        """Factory method for creating Command subclasses from lines of code"""
-        tokens: list[str] = s.strip().split()
+    def parse(s: str, tokens: Optional[Tokens] = None) -> Command:
+        """Factory method for creating Command subclasses from lines of code;
+        pass the same tokens for every line to reuse one buffer for them"""
+        if tokens is None: tokens = Tokens()
+        tokens.load(s.split())
         try:
             # first try to pase this command as a statement
-            return Statement.parse(tokens)
+            statement: Optional[Statement] = Statement.parse(tokens)
+            if statement is not None: return statement
         except CalcParseException as e:
             if verbose: print(e)
         
@@ -39,81 +104,109 @@ class Command(metaclass=ABCMeta):
             
 # define a base class for Expressions
 class Expression(Command, metaclass=ABCMeta):
+    __slots__ = ('_pycode',) # the code object made by as_callable()
     @abstractmethod
     def __init__(self): pass
     @abstractmethod
     def eval(self) -> int: pass
+    @abstractmethod
+    def to_source(self) -> str:
+        """Returns Python source for an expression that computes this one"""
+    @abstractmethod
+    def simplify(self) -> Expression:
+        """Returns an equivalent expression that is cheaper to evaluate"""
+    def as_callable(self) -> CodeType:
+        """Returns this expression compiled to a Python code object, once"""
+        if getattr(self, '_pycode', None) is None:
+            self._pycode = compile(self.simplify().to_source(), '<calc>', 'eval')
+        return self._pycode
+    @staticmethod
+    def eval_code(code: CodeType) -> int:
+        """Runs a code object from as_callable() and returns its value"""
+        try:
+            return eval(code, _code_globals)
+        except KeyError as e:
+            raise CalcEvalException(f"{e.args[0]} is undefined")
     @classmethod
-    def parse(cls, tokens: list[str]) -> Expression:
-        """Factory method for creating Expression subclasses from tokens"""
-        subclasses: list[type[Expression]] = cls.__subclasses__()
-        for subclass in subclasses:
-            try:
-                return subclass.parse(tokens)
-            except CalcParseException as e:
-                if verbose: print(e)
-        raise CalcParseException(f"Unrecognized Expression: {' '.join(tokens)}")
+    def parse(cls, tokens: list[str], lo: int = 0, hi: Optional[int] = None) -> Expression:
+        """Factory method for creating Expression subclasses from tokens[lo:hi]"""
+        if not isinstance(tokens, Tokens): tokens = Tokens(tokens)
+        if hi is None: hi = len(tokens)
+        if hi <= lo:
+            raise CalcParseException("Unrecognized Expression: (empty)")
+        # the first token alone decides which subclass can parse the tokens,
+        # so only that subclass is tried and its errors are passed along
+        first: int = tokens.tags[lo]
+        if first not in _DISPATCH:
+            raise CalcParseException(f"Unrecognized Expression: {tokens.text(lo, hi)}")
+        return _DISPATCH[first](tokens, lo, hi)
     @staticmethod
-    def match_parens(tokens: list[str]) -> int:
-        """Searches tokens beginning with ( and returns index of matching )"""
+    def match_parens(tokens: Tokens, lo: int, hi: int) -> int:
+        """Takes tokens[lo:hi] beginning with ( and returns index of matching )"""
         # ensure tokens is such that a matching ) might exist
-        if len(tokens) < 2: raise CalcParseException("Expression too short")
-        if tokens[0] != '(': raise CalcParseException("No opening ( found")
-        # track the depth of nested ()
-        depth: int = 0
-        for i,token in enumerate(tokens):
-            # when a ( is found, increase the depth
-            if token == '(': depth += 1
-            # when a ) is found, decrease the depth
-            elif token == ')': depth -= 1
-            # if after a token the depth reaches 0, return that index
-            if depth == 0: return i
-        # if the depth never again reached 0 then parens do not match
-        raise CalcParseException("No closing ) found")
+        if hi - lo < 2: raise CalcParseException("Expression too short")
+        if tokens.tags[lo] != TOK_LPAREN: raise CalcParseException("No opening ( found")
+        # the matching ) was found when the tokens were made
+        end: int = tokens.matches.get(lo, hi)
+        # if the ) is missing or past the span then parens do not match
+        if end >= hi: raise CalcParseException("No closing ) found")
+        return end
 
 # define a base class for Statements
 class Statement(Command, metaclass=ABCMeta):
+    __slots__ = ()
     @abstractmethod
     def __init__(self): pass
     @abstractmethod
     def eval(self) -> None: pass
     @staticmethod
-    def parse(tokens: list[str]) -> Statement:
-        """Factory method for creating Statement subclasses from tokens"""
+    def parse(tokens: list[str], lo: int = 0, hi: Optional[int] = None) -> Optional[Statement]:
+        """Factory method for creating Statement subclasses from tokens[lo:hi],
+        or None if the tokens do not begin any kind of statement"""
+        if not isinstance(tokens, Tokens): tokens = Tokens(tokens)
+        if hi is None: hi = len(tokens)
         # Only valid statement is set
-        return Set.parse(tokens)
+        return Set.parse(tokens, lo, hi)
 
 # define a class to represent the "set" statement
 class Set(Statement):
+    __slots__ = ('name', 'value', '_code', '_target')
     def __init__(self, name: Name, value: Expression): # Set command has access to either side of the =
         self.name = name
         self.value = value
+        # the value's code object and the context key, bound on the first eval
+        self._code: Optional[CodeType] = None
+        self._target: str = ''
     def eval(self) -> None: # Set the expression in context dic to the right name
-        context[self.name.name] = self.value.eval()
-    def __eq__(self, other: Any): # Set statements being equal; same parse tree
-        return (isinstance(other, Set) and 
-                self.name == other.name and self.value == other.value)
+        if self._code is None:
+            self._code = self.value.as_callable()
+            self._target = sys.intern(self.name.name)
+        context[self._target] = Expression.eval_code(self._code)
+    def _key(self) -> tuple: # Set statements being equal; same parse tree
+        return (self.name, self.value)
     @staticmethod
-    def parse(tokens: list[str]) -> Set:
-        """Factory method for creating Set commands from tokens"""
+    def parse(tokens: Tokens, lo: int, hi: int) -> Optional[Set]:
+        """Factory method for creating Set commands from tokens[lo:hi], or None
+        if the tokens do not begin with 'set'"""
+        # 1 Make sure first token is set; a line that does not start with it
+        # is simply not a Set, which is no error worth raising over
+        if hi == lo or tokens.tags[lo] != TOK_SET:
+            return None
         # Make sure there are enough tokens
-        if len(tokens) < 4:
+        if hi - lo < 4:
             raise CalcParseException("Statement is too short for Set")
-        # 1 Make sure first token is set
-        if tokens[0] != 'set':
-            raise CalcParseException("Set statements must begin with 'set'")
         # 2 Make sure next token is a valid name
         try:
-            name: Name = Name.parse([tokens[1]])
+            name: Name = Name.parse(tokens, lo + 1, lo + 2)
         except CalcParseException as e:
             raise CalcParseException("No name found for Set statement")
         # 3 Make sure the next token is an '='
-        if tokens[2] != '=':
+        if tokens.tags[lo + 2] != TOK_EQ:
             raise CalcParseException("Set statement requires '='")
         # 4 Ensure remaining tokens represent an expression
         try:
             # Taking tokens from 3 on as an expression
-            value: Expression = Expression.parse(tokens[3:])    
+            value: Expression = Expression.parse(tokens, lo + 3, hi)
         except CalcParseException:
             raise CalcParseException("No valuse found for Set statement")
         # If this point is reached, this is a valid Set command
@@ -121,118 +214,204 @@ class Set(Statement):
 
 # define an expression for the addition operation
 class Add(Expression):
+    __slots__ = ('first', 'second')
     def __init__(self, first: Expression, second: Expression):
         self.first = first
         self.second = second
     def eval(self) -> int: # Add the integer values together
-        return self.first.eval() + self.second.eval()
-    def __eq__(self, other) -> bool:
-        return (isinstance(other, Add) and
-                self.first == other.first and self.second == other.second)
+        a: int = self.first.eval()
+        b: int = self.second.eval()
+        return a + b
+    def to_source(self) -> str:
+        return f"({self.first.to_source()}+{self.second.to_source()})"
+    def simplify(self) -> Expression:
+        return Sum.of([self.first.simplify(), self.second.simplify()])
+    def _key(self) -> tuple:
+        return (self.first, self.second)
     @staticmethod
-    def parse(tokens: list[str]) -> Add:
-        """Factory method for creating Add expressions from tokens"""
-        s = ' '.join(tokens)
-        if len(tokens) < 7:
-            raise CalcParseException(f"Not enough tokens for Add in {s}")
-        if tokens[0] != '+' or tokens[1] != '(':
-            raise CalcParseException(f"Add must begin with '+ (' in {s}")
+    def parse(tokens: Tokens, lo: int, hi: int) -> Add:
+        """Factory method for creating Add expressions from tokens[lo:hi]"""
+        if hi - lo < 7:
+            raise CalcParseException(f"Not enough tokens for Add in {tokens.text(lo, hi)}")
+        if tokens.tags[lo] != TOK_PLUS or tokens.tags[lo + 1] != TOK_LPAREN:
+            raise CalcParseException(f"Add must begin with '+ (' in {tokens.text(lo, hi)}")
         # Make sure the next token(s) represent an expression
         try:
-            cut = Expression.match_parens(tokens[1:]) + 1
-            first: Expression = Expression.parse(tokens[2:cut])
+            cut: int = Expression.match_parens(tokens, lo + 1, hi)
+            first: Expression = Expression.parse(tokens, lo + 2, cut)
         except CalcParseException as e:
-            raise CalcParseException(f"Unable to find first addend in {s}")
+            raise CalcParseException(f"Unable to find first addend in {tokens.text(lo, hi)}")
         # Make sure that there are enough tokens left after first expression
-        tokens = tokens[cut + 1:]
-        if len(tokens) < 3:
-            raise CalcParseException(f"Not enough tokens for Add in {s}")
+        if hi - (cut + 1) < 3:
+            raise CalcParseException(f"Not enough tokens for Add in {tokens.text(lo, hi)}")
         # Make sure that remaining tokens begin and end with ()
-        if tokens[0] != '(' or tokens[-1] != ')':
-            raise CalcParseException(f"Addneds must be wrapped in (): {s}")
+        if tokens.tags[cut + 1] != TOK_LPAREN or tokens.tags[hi - 1] != TOK_RPAREN:
+            raise CalcParseException(f"Addneds must be wrapped in (): {tokens.text(lo, hi)}")
         # Make sure that the stuff in the middle is a valid expression
         try:
-            second: Expression = Expression.parse(tokens[1:-1])
+            second: Expression = Expression.parse(tokens, cut + 2, hi - 1)
         except CalcParseException as e:
-            raise CalcParseException(f"Unable to find the second addend in {s}")
+            raise CalcParseException(f"Unable to find the second addend in {tokens.text(lo, hi)}")
         # POINT REACHED MEANS VALID ADD EXPRESSION
         return Add(first, second)
 
 # define an expression for the subtraction operation
 class Subtract(Expression):
+    __slots__ = ('first', 'second')
     def __init__(self, first: Expression, second: Expression):
         self.first = first
         self.second = second
     def eval(self) -> int: # Subtract the integer values together
-        return self.first.eval() - self.second.eval()
-    def __eq__(self, other) -> bool:
-        return (isinstance(other, Subtract) and
-                self.first == other.first and self.second == other.second)
+        a: int = self.first.eval()
+        b: int = self.second.eval()
+        return a - b
+    def to_source(self) -> str:
+        return f"({self.first.to_source()}-{self.second.to_source()})"
+    def simplify(self) -> Expression:
+        return Sum.of([self.first.simplify(), Neg.of(self.second.simplify())])
+    def _key(self) -> tuple:
+        return (self.first, self.second)
     @staticmethod
-    def parse(tokens: list[str]) -> Subtract:
-        """Factory method for creating Subtract expressions from tokens"""
-        s = ' '.join(tokens)
-        if len(tokens) < 7:
-            raise CalcParseException(f"Not enough tokens for Subtract in {s}")
-        if tokens[0] != '-' or tokens[1] != '(':
-            raise CalcParseException(f"Add must begin with '- (' in {s}")
+    def parse(tokens: Tokens, lo: int, hi: int) -> Subtract:
+        """Factory method for creating Subtract expressions from tokens[lo:hi]"""
+        if hi - lo < 7:
+            raise CalcParseException(f"Not enough tokens for Subtract in {tokens.text(lo, hi)}")
+        if tokens.tags[lo] != TOK_MINUS or tokens.tags[lo + 1] != TOK_LPAREN:
+            raise CalcParseException(f"Add must begin with '- (' in {tokens.text(lo, hi)}")
         # Make sure the next token(s) represent an expression
         try:
-            cut = Expression.match_parens(tokens[1:]) + 1
-            first: Expression = Expression.parse(tokens[2:cut])
+            cut: int = Expression.match_parens(tokens, lo + 1, hi)
+            first: Expression = Expression.parse(tokens, lo + 2, cut)
         except CalcParseException as e:
-            raise CalcParseException(f"Unable to find first minuend in {s}")
+            raise CalcParseException(f"Unable to find first minuend in {tokens.text(lo, hi)}")
         # Make sure that there are enough tokens left after first expression
-        tokens = tokens[cut + 1:]
-        if len(tokens) < 3:
-            raise CalcParseException(f"Not enough tokens for Subtract in {s}")
+        if hi - (cut + 1) < 3:
+            raise CalcParseException(f"Not enough tokens for Subtract in {tokens.text(lo, hi)}")
         # Make sure that remaining tokens begin and end with ()
-        if tokens[0] != '(' or tokens[-1] != ')':
-            raise CalcParseException(f"Subtrahends must be wrapped in (): {s}")
+        if tokens.tags[cut + 1] != TOK_LPAREN or tokens.tags[hi - 1] != TOK_RPAREN:
+            raise CalcParseException(f"Subtrahends must be wrapped in (): {tokens.text(lo, hi)}")
         # Make sure that the stuff in the middle is a valid expression
         try:
-            second: Expression = Expression.parse(tokens[1:-1])
+            second: Expression = Expression.parse(tokens, cut + 2, hi - 1)
         except CalcParseException as e:
-            raise CalcParseException(f"Unable to find the second subtrahend in {s}")
+            raise CalcParseException(f"Unable to find the second subtrahend in {tokens.text(lo, hi)}")
         # POINT REACHED MEANS VALID SUBTRACT EXPRESSION
         return Subtract(first, second)
 
 # define an expression for an integer constant
 class Number(Expression):
+    __slots__ = ('num',)
     def __init__(self, num: int):
         self.num = num # Sets the number value
     def eval(self) -> int:
         return self.num # Returns what number it is
-    def __eq__(self, other: Any) -> bool: # Reference Equality
-        return (isinstance(other, Number) and other.num == self.num) # Returns if two ints are the same
+    def to_source(self) -> str:
+        return str(self.num)
+    def simplify(self) -> Expression:
+        return self
+    def _key(self) -> tuple: # Two Numbers are equal if their ints are the same
+        return (self.num,)
     @staticmethod
-    def parse(tokens: list[str]) -> Number:
-        """Factory method for creating Number expressions from tokens"""
+    def parse(tokens: Tokens, lo: int, hi: int) -> Number:
+        """Factory method for creating Number expressions from tokens[lo:hi]"""
         # Ensure that there are enough tokens for a number
-        if len(tokens) != 1:
-            raise CalcParseException(f"Wrong number of tokens ({len(tokens)}) for number")
+        if hi - lo != 1:
+            raise CalcParseException(f"Wrong number of tokens ({hi - lo}) for number")
         # Ensure that the tokens are numbers
-        if not tokens[0].isdigit():
+        if tokens.tags[lo] != TOK_NUMBER:
             raise CalcParseException("Numbers can contain only digits")
-        return Number(int(tokens[0]))
+        return Number(int(tokens[lo]))
 
 # define an expression for a variable name
 class Name(Expression):
+    __slots__ = ('name', '__weakref__') # __weakref__ so _names can hold it weakly
     def __init__(self, name: str):
-        self.name = name # Sets the name value
+        # Sets the name value, interned so context lookups can compare by identity
+        self.name = sys.intern(name)
     def eval(self) -> int:
         if self.name in context: # If there is a variable under that name return it
             return context[self.name] 
         else: # If there is no variable under that name then error
             raise CalcEvalException(f"{self.name} is undefined")
-    def __eq__(self, other: Any) -> bool: # Reference Equality
-        return (isinstance(other, Name) and other.name == self.name)
+    def to_source(self) -> str:
+        # index context by the name so it can never clash with Python's own
+        return f"context[{self.name!r}]"
+    def simplify(self) -> Expression:
+        return self
+    def _key(self) -> tuple: # Two Names are equal if their strings are the same
+        return (self.name,)
     @staticmethod
-    def parse(tokens: list[str]) -> Name:
-        """Factory method for creating Name expressions from tokens"""
-        if len(tokens) != 1:
+    def parse(tokens: Tokens, lo: int, hi: int) -> Name:
+        """Factory method for creating Name expressions from tokens[lo:hi]"""
+        if hi - lo != 1:
             raise CalcParseException("Wrong number of tokens for Name")
-        if not tokens[0].isalpha():
+        # 'set' is tagged as a keyword but is still a name made of letters
+        if tokens.tags[lo] != TOK_NAME and tokens.tags[lo] != TOK_SET:
             raise CalcParseException("Names can contain letters")
-        return Name(tokens[0])
-        
\ No newline at end of file
+        # reuse the Name already made for this variable if there is one
+        name: Optional[Name] = _names.get(tokens[lo])
+        if name is None:
+            name = _names[tokens[lo]] = Name(tokens[lo])
+        return name
+
+# define an expression for adding up any number of terms, which simplify()
+# builds from chains of Add and Subtract; it is never parsed from tokens
+class Sum(Expression):
+    __slots__ = ('terms',)
+    def __init__(self, terms: list[Expression]):
+        self.terms = terms
+    def eval(self) -> int: # Add up all of the terms in one loop
+        return sum([term.eval() for term in self.terms])
+    def to_source(self) -> str:
+        return f"({'+'.join([term.to_source() for term in self.terms])})"
+    def simplify(self) -> Expression:
+        return Sum.of([term.simplify() for term in self.terms])
+    def _key(self) -> tuple:
+        return tuple(self.terms)
+    @staticmethod
+    def of(terms: list[Expression]) -> Expression:
+        """Builds a Sum of terms, merging in the terms of any nested Sum and
+        adding all of the Number terms together ahead of time"""
+        flat: list[Expression] = []
+        total: int = 0
+        folded: bool = False
+        for term in terms:
+            for t in (term.terms if isinstance(term, Sum) else [term]):
+                if isinstance(t, Number):
+                    total += t.num
+                    folded = True
+                else: flat.append(t)
+        # a constant of 0 only needs to be kept when nothing else is left
+        if folded and (total != 0 or not flat): flat.append(Number(total))
+        return flat[0] if len(flat) == 1 else Sum(flat)
+
+# define an expression for negating a value, which simplify() builds from
+# the right side of a Subtract; it is never parsed from tokens
+class Neg(Expression):
+    __slots__ = ('value',)
+    def __init__(self, value: Expression):
+        self.value = value
+    def eval(self) -> int:
+        return -self.value.eval()
+    def to_source(self) -> str:
+        return f"(-{self.value.to_source()})"
+    def simplify(self) -> Expression:
+        return Neg.of(self.value.simplify())
+    def _key(self) -> tuple:
+        return (self.value,)
+    @staticmethod
+    def of(value: Expression) -> Expression:
+        """Builds the negation of value, pushing it into Sums and Negs"""
+        if isinstance(value, Number): return Number(-value.num)
+        if isinstance(value, Neg): return value.value
+        if isinstance(value, Sum): return Sum([Neg.of(term) for term in value.terms])
+        return Neg(value)
+
+# map the tag of the leading token of an expression to the parser for it
+_DISPATCH: dict[int, Callable[[Tokens, int, int], Expression]] = {
+    TOK_PLUS: Add.parse,
+    TOK_MINUS: Subtract.parse,
+    TOK_NUMBER: Number.parse,
+    TOK_NAME: Name.parse,
+    TOK_SET: Name.parse, # a line that is not a Set statement may use set as a name
+}
@@ -33,6 +33,14 @@ class TestCalcEvaluation(unittest.TestCase):
         Set(var, val2).eval()
         self.assertEqual(var.eval(), val2.eval())
     
+    def test_set_repeated(self):
+        # make sure a Set run again picks up changes to the names it uses
+        var: Name = Name('repeatVar')
+        Set(var, Number(1)).eval()
+        increment: Set = Set(var, Add(var, Number(1)))
+        for _ in range(3): increment.eval()
+        self.assertEqual(var.eval(), 4)
+
     def test_simple_add(self):
         num1: Number = Number(5)
         num2: Number = Number(42)
@@ -63,4 +71,36 @@ class TestCalcEvaluation(unittest.TestCase):
         Set(b, Subtract(Number(98), Number(62))).eval()
         self.assertEqual(Subtract(a,b).eval(), 29)
 
+    def test_callable(self):
+        # make sure the compiled Python code computes the same value as eval
+        Set(Name('callableVar'), Number(8)).eval()
+        expr: Expression = Subtract(Add(Number(50), Name('callableVar')), Number(3))
+        self.assertEqual(Expression.eval_code(expr.as_callable()), expr.eval())
+        self.assertIs(expr.as_callable(), expr.as_callable())
+        with self.assertRaises(CalcEvalException):
+            Expression.eval_code(Name('DoesNotExist').as_callable())
+        with self.assertRaises(CalcEvalException):
+            Set(Name('x'), Name('DoesNotExist')).eval()
+
+    def test_simplify(self):
+        # make sure chains of Add and Subtract flatten into one Sum
+        a: Expression = Name('sumA')
+        b: Expression = Name('sumB')
+        c: Expression = Name('sumC')
+        expr: Expression = Subtract(Add(a, b), Subtract(c, Number(4)))
+        self.assertEqual(expr.simplify(), Sum([a, b, Neg(c), Number(4)]))
+        Set(a, Number(10)).eval()
+        Set(b, Number(20)).eval()
+        Set(c, Number(5)).eval()
+        self.assertEqual(expr.simplify().eval(), expr.eval())
+        self.assertEqual(Expression.eval_code(expr.as_callable()), 29)
+
+    def test_constant_folding(self):
+        # make sure subtrees without names are computed by simplify
+        x: Expression = Name('foldVar')
+        self.assertEqual(Subtract(Add(Number(4), Number(3)), Number(2)).simplify(), Number(5))
+        self.assertEqual(Add(x, Add(Number(1), Number(2))).simplify(), Sum([x, Number(3)]))
+        self.assertEqual(Add(x, Subtract(Number(2), Number(2))).simplify(), x)
+        self.assertEqual(Subtract(Number(2), x).simplify(), Sum([Neg(x), Number(2)]))
+
 if __name__=='__main__': unittest.main()
\ No newline at end of file
@@ -19,10 +19,23 @@ class TestCalcParsing(unittest.TestCase):
         cmd: Command = Command.parse("hello")
         self.assertEqual(cmd, Name("hello"))
     
+    def test_shared_name(self):
+        # make sure every use of a variable is parsed to the same Name
+        cmd: Command = Command.parse("+ ( hello ) ( - ( 1 ) ( hello ) )")
+        self.assertIs(cmd.first, cmd.second.second)
+        self.assertIs(cmd.first, Command.parse("hello"))
+
     def test_simple_set(self):
         cmd: Command = Command.parse("set hello = 64")
         self.assertEqual(cmd, Set(Name("hello"), Number(64)))
     
+    def test_not_statement(self):
+        # make sure tokens that do not begin with set are not a statement
+        self.assertIsNone(Statement.parse("+ ( 1 ) ( 2 )".split()))
+        self.assertIsNone(Statement.parse([]))
+        with self.assertRaises(CalcParseException):
+            Statement.parse("set x 5".split())
+
     def test_simple_add(self):
         cmd1: Command = Command.parse("+ ( 42 ) ( 64 )")
         self.assertEqual(cmd1, Add(Number(42), Number(64)))
@@ -52,6 +65,37 @@ class TestCalcParsing(unittest.TestCase):
     def test_complex_set(self):
         cmd: Command = Command.parse("set x = + ( + ( 1 ) ( 2 ) ) ( hello )")
         self.assertEqual(cmd, Set(Name("x"), Add(Add(Number(1),Number(2)),Name("hello"))))
+
+    def test_token_span(self):
+        # make sure an expression can be parsed from part of a token list
+        tokens: list[str] = "set x = + ( 7 ) ( y )".split()
+        self.assertEqual(Expression.parse(tokens, 3), Add(Number(7), Name("y")))
+        self.assertEqual(Expression.parse(tokens, 5, 6), Number(7))
+
+    def test_equality(self):
+        # make sure equal parse trees compare and hash the same
+        self.assertEqual(hash(Command.parse("+ ( 1 ) ( x )")), hash(Add(Number(1), Name("x"))))
+        self.assertNotEqual(Add(Number(1), Number(2)), Subtract(Number(1), Number(2)))
+        self.assertNotEqual(Number(1), Name("1"))
+        self.assertIn(Set(Name("x"), Number(1)), {Set(Name("x"), Number(1))})
+
+    def test_reused_tokens(self):
+        # make sure one buffer of tokens can be reused for many lines
+        tokens: Tokens = Tokens()
+        self.assertEqual(Command.parse("+ ( 1 ) ( 2 )", tokens), Add(Number(1), Number(2)))
+        self.assertEqual(Command.parse("set y = 3", tokens), Set(Name("y"), Number(3)))
+        self.assertEqual(Command.parse("- ( 4 ) ( 5 )", tokens), Subtract(Number(4), Number(5)))
+
+    def test_set_as_name(self):
+        # make sure set is still a valid variable name outside of the keyword
+        self.assertEqual(Command.parse("set set = 2"), Set(Name("set"), Number(2)))
+        self.assertEqual(Command.parse("set"), Name("set"))
+
+    def test_unrecognized(self):
+        # make sure tokens that begin no known expression are rejected
+        for bad in ["* ( 1 ) ( 2 )", "( 1 )", "+ ( 1 ) ( 2 ) ( 3 )", "1x"]:
+            with self.assertRaises(CalcParseException):
+                Command.parse(bad)
         
 
 if __name__=='__main__': unittest.main()
\ No newline at end of file
@@ -7,25 +7,46 @@
 
 from grove_lang import *
 import builtins
+import functools
 import os
 import sys
+from typing import Iterator
 sys.path.append(os.path.abspath(os.path.dirname(__file__)))
 
+@functools.lru_cache(maxsize=256)
+def parse_cached(s: str) -> Command:
+    """Parses a line of code, reusing the parse tree when a line repeats;
+    parse trees are never changed by eval, so they are safe to share"""
+    return Command.parse(s)
+
+def read_lines() -> Iterator[str]:
+    """Yields each line of code, prompting for it only when it is typed in"""
+    if sys.stdin.isatty():
+        while True:
+            try:
+                yield input('Grove>> ')
+            except EOFError:
+                return
+    else:
+        # piped in from a file: read the lines straight from stdin
+        for line in iter(sys.stdin.readline, ''):
+            yield line.rstrip('\n')
+
 def main():
-    # loop until the command :done is found
-    while True:
-        s: str = input('')
-        # s: str = input('Grove>>')
+    # write to stdout directly and flush once at the end, rather than
+    # print flushing again for every line of output
+    write = sys.stdout.write
+    # loop until exit or quit is found, or the input runs out
+    for s in read_lines():
         if (s.strip() == 'exit') or (s.strip() == 'quit'): break
         try:
-            cmd = Command.parse(s).eval()
-            if cmd is not None: print(cmd)
+            cmd = parse_cached(s).eval()
+            if cmd is not None: write(f"{cmd}\n")
         except GroveParseError as e:
-            print(f"Error Parsing {s}")
-            print(e)
+            write(f"Error Parsing {s}\n{e}\n")
         except GroveEvalError as e:
-            print(f"error Evaluating {s}")
-            print(e)
+            write(f"error Evaluating {s}\n{e}\n")
+    sys.stdout.flush()
 
 if __name__ == "__main__": main()
     
\ No newline at end of file
@@ -2,361 +2,381 @@ from __future__ import annotations
 ## Parse tree nodes for the Grove language
 import re
 import sys
-import importlib
 import builtins
-from abc import ABCMeta, abstractmethod
-from typing import Any, Union
+from typing import Any, Callable
 
 # add a "verbose" flag to print all parse exceptions while debugging
 verbose = False
 
+# A token is a quoted string without whitespace, a (possibly dotted) word,
+# a run of digits, or one of ( ) + =; anything else is one character token
+# of its own so that it fails to parse rather than vanishing from the line
+_TOKEN_RE = re.compile(r'"[^"\s]*"|[A-Za-z_]\w*(?:\.\w+)*|\d+|[()+=]|\S')
+
+# Numbers are only digits; names start with a letter followed by letters,
+# digits, or underscores, and may not be one of the reserved keywords
+_NUM_RE = re.compile(r'[0-9]+')
+_NAME_RE = re.compile(r'[A-Za-z][A-Za-z0-9_]*')
+# every Grove keyword is reserved: statements and several expressions are
+# recognized by the keyword they begin with, so none of them may be a name
+_RESERVED = frozenset({'set', 'call', 'new', 'import', 'quit', 'exit'})
+
+# marks a missing value where None could be a real one
+_MISSING = object()
+
 # The exception classes from the notes.
 class GroveError(Exception): pass
 class GroveParseError(GroveError): pass
 class GroveEvalError(GroveError): pass
 
-# context: dict[str,object] = {} #Make this globals()
-globals()
+# Grove variables are kept in this module's globals() rather than a context;
+# bind the dict once instead of calling globals() on every lookup
+_G: dict[str, Any] = globals()
 
 # Command Base Class (superclass of expressions and statements)
 class Command(object):
-    @abstractmethod
-    def __init__(self): pass
-    @abstractmethod
-    def eval(self) -> Union[int,None]: pass
+    __slots__ = () # so the slots of subclasses leave out a __dict__
     @staticmethod
     def parse(s: str) -> Command:
         """Factory method for creating Command subclasses from lines of code"""
-        tokens: list[str] = s.strip().split()
         try:
-            # first try to pase this command as a statement
-            return Statement.parse(tokens)
+            return Parser(_TOKEN_RE.findall(s)).parse_all(Parser.parse_command)
         except GroveParseError as e:
-            if verbose: print(e)
-        
-        try:
-            # if it is not a statement it must be an expression
-            return Expression.parse(tokens)
-        except GroveParseError as e:
-            if verbose: print(e)
-            
-        raise GroveParseError(f"Unrecognized Command: {s}")
+            # the only debug output of the parser, and only when asked for
+            if verbose: print(f"Parse error in '{s}': {e}")
+            raise
 
 # Expression Base Class (superclass of Num, Name, StringLiteral, etc.)
 class Expression(Command):
-    @abstractmethod
-    def __init__(self): pass
-    @abstractmethod
-    def eval(self) -> int: pass
+    __slots__ = ()
     @classmethod
     def parse(cls, tokens: list[str]) -> Expression:
         """Factory method for creating Expression subclasses from tokens"""
-        subclasses: list[type[Expression]] = cls.__subclasses__()
-        for subclass in subclasses:
-            try:
-                return subclass.parse(tokens)
-            except GroveParseError as e:
-                if verbose: print(e)
-        raise GroveParseError(f"Unrecognized Expression: {' '.join(tokens)}")
-    @staticmethod
-    def match_parens(tokens: list[str]) -> int:
-        """Searches tokens beginning with ( and returns index of matching )"""
-        # ensure tokens is such that a matching ) might exist
-        if len(tokens) < 2: raise GroveParseError("Expression too short")
-        if tokens[0] != '(': raise GroveParseError("No opening ( found")
-        # track the depth of nested ()
-        depth: int = 0
-        for i,token in enumerate(tokens):
-            # when a ( is found, increase the depth
-            if token == '(': depth += 1
-            # when a ) is found, decrease the depth
-            elif token == ')': depth -= 1
-            # if after a token the depth reaches 0, return that index
-            if depth == 0: return i
-        # if the depth never again reached 0 then parens do not match
-        raise GroveParseError("No closing ) found")
+        return Parser(tokens).parse_all(Parser.parse_expr)
 
 # Statement Base Class (superclass of Assign, Terminate, and Import)
 class Statement(Command):
-    @abstractmethod
-    def __init__(self): pass
-    @abstractmethod
-    def eval(self) -> None: pass
-    @staticmethod
-    def parse(tokens: list[str]) -> Statement:
+    __slots__ = ()
+    @classmethod
+    def parse(cls, tokens: list[str]) -> Statement:
         """Factory method for creating Statement subclasses from tokens"""
-        # Only valid statement is Assignment, Terminate, or Import
-        try:
-            # try to parse as assignment
-            return Assignment.parse(tokens)
-        except GroveParseError as e:
-            if verbose: print(e)
-        try:
-            # try to parse as terminate
-            return Terminate.parse(tokens)
-        except GroveParseError as e:
-            if verbose: print(e)
-            
-        try:
-            # try to parse as import
-            return Import.parse(tokens)
-        except GroveParseError as e:
-            if verbose: print(e)
-                
-        raise GroveParseError(f"Unrecognized Command on tokens: {tokens}")
+        return Parser(tokens).parse_all(Parser.parse_stmt)
 
 # -----------------------------------------------------------------------------
 # Implement each of the following parse tree nodes for the Grove language
 # -----------------------------------------------------------------------------
 
 class Number(Expression):
+    __slots__ = ('num',)
     def __init__(self, num: int):
         self.num = num # Sets the number value
     def eval(self) -> int:
         return self.num # Returns what number it is
     def __eq__(self, other: Any) -> bool: # Reference Equality
         return (isinstance(other, Number) and other.num == self.num) # Returns if two ints are the same
-    @staticmethod
-    def parse(tokens: list[str]) -> Number:
-        """Factory method for creating Number expressions from tokens"""
-        # Ensure that there are enough tokens for a number
-        if len(tokens) != 1:
-            raise GroveParseError(f"Wrong number of tokens ({len(tokens)}) for number")
-        # Ensure that the tokens are numbers
-        if not tokens[0].isdigit():
-            raise GroveParseError("Numbers can contain only digits")
-        return Number(int(tokens[0]))
+    def __hash__(self) -> int: # Equal Numbers hash the same
+        return hash((Number, self.num))
 
 class StringLiteral(Expression):
+    __slots__ = ('string',)
     def __init__(self, string: str):
         self.string = string # Sets the string value
     def eval(self) -> int:
         return self.string # Return the string that is present
     def __eq__(self, other: Any) -> bool: # Reference Equality
         return (isinstance(other, StringLiteral) and other.string == self.string)
-    @staticmethod
-    def parse(tokens: list[str]) -> StringLiteral:
-        """Factory method for creating string expressions from tokens"""
-        if len(tokens) != 1:
-            raise GroveParseError("Wrong number of tokens for string")
-        if tokens[0][0] != '"' or tokens[0][len(tokens) - 1] != '"':
-            raise GroveParseError("Needs quotes on the sides")
-        
-        return StringLiteral(tokens[0][1:(len(tokens)-2)])
+    def __hash__(self) -> int: # Equal StringLiterals hash the same
+        return hash((StringLiteral, self.string))
 
 class Object(Expression):
-    def __init__(self, targetObject: object):
-        self.object = targetObject
+    __slots__ = ('target',)
+    def __init__(self, target: str):
+        self.target = target # the (possibly dotted) name of what to make
     def eval(self) -> object:
-        return self.object; 
-    def __eq__(self, o) -> bool:
-        return self.object.__eq__(o) 
-    @staticmethod
-    def parse(tokens: list[str]) -> Object:
-        """Factory method for creating object expression from tokens"""
-        s = ' '.join(tokens)
-        
-        if len(tokens) != 2:
-            raise GroveParseError(f"Wrong amount of tokens for parsing object: '{s}'")
-        if tokens[0] != "new":
-            raise GroveParseError(f"Did not find 'new' instead found {tokens[0]}")
-        
-        # Look for burried Object "aka. something seperated by a ."
-        pieces = tokens[1].split(".")
-        if pieces[0] in globals():
-            if len(pieces) == 1:
-                return Object(globals()[pieces[0]])
-            else:
-                if type(globals()[pieces[0]]) == dict:
-                    if pieces[1] in globals()[pieces[0]]:
-                        return Object(globals()[pieces[0]][pieces[1]]()) # The orgional way that worked for test 5
-                else:
-                    index = dir(globals()[pieces[0]]).index(pieces[1]) # attempting to handle the import
-                    return Object(dir(globals()[pieces[0]])[index])
-                
-        raise GroveParseError(f"Couldn't find the object '{s}' in modules")
-    
+        # Look for burried Object "aka. something seperated by a ." each time
+        # this is evaluated, so that every eval makes a new instance of it
+        pieces = self.target.split(".")
+        found = _G.get(pieces[0], _MISSING)
+        for piece in pieces[1:]:
+            if found is _MISSING: break
+            if isinstance(found, dict): # such as __builtins__
+                found = found.get(piece, _MISSING)
+            else: # such as a class in an imported module
+                found = getattr(found, piece, _MISSING)
+        if found is _MISSING:
+            raise GroveEvalError(f"Couldn't find the object '{self.target}' in modules")
+        # a single name stands for the object bound to it, which is not called
+        if len(pieces) == 1:
+            return found
+        if not callable(found):
+            raise GroveEvalError(f"Couldn't find the object '{self.target}' in modules")
+        try:
+            return found()
+        except TypeError:
+            raise GroveEvalError(f"Couldn't make a new '{self.target}' with no arguments")
+    def __eq__(self, other: Any) -> bool:
+        return (isinstance(other, Object) and other.target == self.target)
+    def __hash__(self) -> int:
+        return hash((Object, self.target))
+
 class Call(Expression):
-    def __init__(self, ref: Name, method: Name, args: list[Expression]):
+    __slots__ = ('ref', 'method', 'args')
+    def __init__(self, ref: Name, method: str, args: tuple[Expression, ...]):
         self.ref = ref
-        self.method = method
-        self.args = args
+        self.method = sys.intern(method) # interned like Name, for getattr
+        self.args = tuple(args) # parsed once and evaluated again on every call
 
     def eval(self) -> Any:
+        # evaluate the reference once and use that object from here on
         try:
-            self.ref.eval()
-        except:
+            obj = self.ref.eval()
+        except GroveEvalError:
             raise GroveEvalError(f"{self.ref.name} not defined in scope.")
-        if self.method not in dir(self.ref.eval()):
+        # one getattr both checks for the method and fetches it
+        method = getattr(obj, self.method, _MISSING)
+        if method is _MISSING:
             raise GroveEvalError(f"{self.method} not defined for {self.ref.name}")
-        if not callable(getattr(self.ref.eval(), self.method)):
+        if not callable(method):
             raise GroveEvalError(f"{self.method} not callable on {self.ref.name}")
+        args = [arg.eval() for arg in self.args]
         try:
-            return getattr(self.ref.eval(), self.method)(*[arg.eval() for arg in self.args])
-        except:
-            raise GroveParseError(f"incorrect number of parameters for {self.method} ({len(self.args)} given)")
-        
+            return method(*args)
+        except TypeError:
+            raise GroveEvalError(f"incorrect number of parameters for {self.method} ({len(args)} given)")
 
-    @staticmethod
-    def parse(tokens: list[str]) -> Call:
-        """Factory method for creating call expressions from tokens"""
-        if len(tokens) < 5: # check for correct number of tokens
-            raise GroveParseError(f"Wrong number of tokens ({len(tokens)}) for Call")
-        if tokens[0] != "call": # make sure we start with call keyword
-            raise GroveParseError(f"Expected 'call' but found {tokens[0]}")
-        if tokens[1] != "(": # make sure expression after call starts and ends with parentheses
-            raise GroveParseError(f"Expected '(' but found {tokens[1]}")
-        if tokens[-1] != ")":
-            raise GroveParseError(f"Expected ')' but found {tokens[-1]}")
-        ref: Name = Name.parse(tokens[2:3])
-        method: str = tokens[3]
-        paramTokens = tokens[4:-1]
-        print(paramTokens)
-        args: list[Expression] = []
-        #while paramTokens:
-        for i in range(len(paramTokens) + 1):
-            try:
-                args.append(Expression.parse(paramTokens[0:i]))
-                paramTokens = paramTokens[i:] # may cause problems for i if there is multiple occurances
-            except:
-                pass
-        return Call(ref, method, args)
-        
-class Addition(Expression):
-    def __init__(self, first: Expression, second: Expression):
-        self.first = first
-        self.second = second
-    def eval(self) -> int: # Add the integer values together
-        return self.first.eval() + self.second.eval()
+class Sum(Expression):
+    __slots__ = ('children',)
+    def __init__(self, children: tuple[Expression, ...]):
+        # the addends, from left to right; + ( + ( a ) ( b ) ) ( c ) is
+        # kept as one Sum of a, b, and c instead of a nested Sum
+        self.children = tuple(children)
+    def eval(self) -> Any: # Add the values together from left to right
+        # not sum(), since that refuses to add strings together
+        children = self.children
+        total = children[0].eval()
+        for child in children[1:]:
+            total = total + child.eval()
+        return total
     def __eq__(self, other) -> bool:
-        return (isinstance(other, Addition) and
-                self.first == other.first and self.second == other.second)
-    @staticmethod
-    def parse(tokens: list[str]) -> Addition:
-        """Factory method for creating Addition expressions from tokens"""
-        s = ' '.join(tokens)
-        if len(tokens) < 7:
-            raise GroveParseError(f"Not enough tokens for Addition in {s}")
-        if tokens[0] != '+' or tokens[1] != '(':
-            raise GroveParseError(f"Addition must begin with '+ (' in {s}")
-        # Make sure the next token(s) represent an expression
-        try:
-            cut = Expression.match_parens(tokens[1:]) + 1
-            first: Expression = Expression.parse(tokens[2:cut])
-        except GroveParseError as e:
-            raise GroveParseError(f"Unable to find first Additionend in {s}")
-        # Make sure that there are enough tokens left after first expression
-        tokens = tokens[cut + 1:]
-        if len(tokens) < 3:
-            raise GroveParseError(f"Not enough tokens for Addition in {s}")
-        # Make sure that remaining tokens begin and end with ()
-        if tokens[0] != '(' or tokens[-1] != ')':
-            raise GroveParseError(f"Additionneds must be wrapped in (): {s}")
-        # Make sure that the stuff in the middle is a valid expression
-        try:
-            second: Expression = Expression.parse(tokens[1:-1])
-        except GroveParseError as e:
-            raise GroveParseError(f"Unable to find the second Additionend in {s}")
-        # POINT REACHED MEANS VALID Addition EXPRESSION
-        return Addition(first, second)
+        return (isinstance(other, Sum) and self.children == other.children)
+    def __hash__(self) -> int:
+        return hash((Sum, self.children))
 
 class Name(Expression):
+    __slots__ = ('name',)
     def __init__(self, name: str):
-        self.name = name # Sets the name value
+        # Sets the name value, interned so globals lookups can compare by identity
+        self.name = sys.intern(name)
     def eval(self) -> int:
-        if self.name in globals(): # If there is a variable under that name return it
-            return globals()[self.name] 
-        else: # If there is no variable under that name then error
+        value = _G.get(self.name, _MISSING) # Get the variable under that name in one lookup
+        if value is _MISSING: # If there is no variable under that name then error
             raise GroveEvalError(f"{self.name} is undefined")
+        return value
     def __eq__(self, other: Any) -> bool: # Reference Equality
         return (isinstance(other, Name) and other.name == self.name)
-    @staticmethod
-    def parse(tokens: list[str]) -> Name:
-        """Factory method for creating Name expressions from tokens"""
-        if len(tokens) != 1:
-            raise GroveParseError("Wrong number of tokens for Name")
-        if not tokens[0][0].isalpha():
-            raise GroveParseError("Name must start with alpha")
-        if not tokens[0].replace("_", "").isalnum():
-            raise GroveParseError("Names can contain letters")
-        if tokens[0] == "call":
-            raise GroveParseError(f"call is a protected word and not a valid name for your variable")
-        return Name(tokens[0])
+    def __hash__(self) -> int: # Equal Names hash the same
+        return hash((Name, self.name))
 
 class Assignment(Statement):
-    def __init__(self, name: Name, value: Expression): # Assignment command has access to either side of the =
-        self.name = name
+    __slots__ = ('name', 'value')
+    def __init__(self, name: str, value: Expression): # Assignment command has access to either side of the =
+        self.name = sys.intern(name) # the name itself, interned like Name
         self.value = value
     def eval(self) -> None: # Assignment the expression in globals dic to the right name
-        globals()[self.name.name] = self.value.eval()
+        _G[self.name] = self.value.eval()
     def __eq__(self, other: Any): # Assignment statements being equal; same parse tree
         return (isinstance(other, Assignment) and 
                 self.name == other.name and self.value == other.value)
-    @staticmethod
-    def parse(tokens: list[str]) -> Assignment:
-        """Factory method for creating Assignment commands from tokens"""
-        # Make sure there are enough tokens
-        if len(tokens) < 4:
-            raise GroveParseError("Statement is too short for Assignment")
-        # 1 Make sure first token is Assignment
-        if tokens[0] != 'set':
-            raise GroveParseError("Assignment statements must begin with 'Assignment'")
-        # 2 Make sure next token is a valid name
-        try:
-            name: Name = Name.parse([tokens[1]])
-        except GroveParseError as e:
-            raise GroveParseError("No name found for Assignment statement")
-        # 3 Make sure the next token is an '='
-        if tokens[2] != '=':
-            raise GroveParseError("Assignment statement requires '='")
-        # 4 Ensure remaining tokens represent an expression
-        try:
-            # Taking tokens from 3 on as an expression
-            value: Expression = Expression.parse(tokens[3:])    
-        except GroveParseError:
-            raise GroveParseError("No valuse found for Assignment statement")
-        # If this point is reached, this is a valid Assignment command
-        return Assignment(name, value)
+    def __hash__(self) -> int:
+        return hash((Assignment, self.name, self.value))
 
-class Import(Expression):
+class Import(Statement):
     # Implement node for "import" statements
+    __slots__ = ('mod',)
     def __init__(self, mod):
         self.mod = mod
     def eval(self):
         #theoretically this should be adding the module to the globals dictionary
-        globals()[self.mod] = importlib.import_module(self.mod)
+        # a module imported before is already in sys.modules, so only
+        # load importlib and go through its finders the first time
+        module = sys.modules.get(self.mod)
+        if module is None:
+            import importlib
+            module = importlib.import_module(self.mod)
+        _G[self.mod] = module
         # self.mod.__name__ = importlib.import_module(self.mod)
-    @staticmethod 
-    def parse(tokens: list[str]):
-        if len(tokens) != 2:
-            raise GroveParseError("Statement is wrong length for Import")
-        #check if first word is import
-        if tokens[0] != "import":
-            raise GroveParseError("First token did not equal 'import'")
-        # try:
-        #     mod:Expression = tokens[1]
-        # except:
-        #     raise GroveParseError("No value found for module in import statement")
-        
-        return Import(tokens[1])
 
 
-class Terminate(Expression):
+class Terminate(Statement):
 	# Implement node for "quit" and "exit" statements
+    __slots__ = ('term',)
     def __init__(self, term:Expression) -> None:
         self.term = term
     def eval(self) -> None: 
         sys.exit()
-    @staticmethod
-    def parse(tokens: list[str]):
-        # make sure there is only 1 token
-        if len(tokens) > 1:
-            raise GroveParseError("Statement is too long for Terminate")
-         # Make sure token is either 'exit' or 'quit'
-        if tokens[0] != 'quit' and tokens[0] != 'exit':
-            raise GroveParseError("Terminate statement must be either 'quit' or 'exit'")
-        try:
-            term:Expression = tokens[0]
-        except:
-            raise GroveParseError("No values found in terminate statement")
-        return Terminate(term)
+
+# -----------------------------------------------------------------------------
+# Parser for turning the tokens of one line into a parse tree
+# -----------------------------------------------------------------------------
+
+class Parser(object):
+    """Recursive descent parser over the tokens of one line; each parse_*
+    method reads one production beginning at the cursor and moves past it"""
+    __slots__ = ('tokens', 'pos', 'matches')
+    def __init__(self, tokens: list[str]):
+        self.tokens = tokens # the tokens being parsed
+        self.pos = 0 # the cursor: index of the next token to read
+        # match up every ( with its ) in one pass over the tokens, so each
+        # group knows where it ends and unbalanced () fail before parsing
+        self.matches: list[int] = [-1] * len(tokens) # index of the matching paren
+        opened: list[int] = [] # indexes of the ( not yet closed
+        for i, token in enumerate(tokens):
+            if token == '(':
+                opened.append(i)
+            elif token == ')':
+                if not opened:
+                    raise GroveParseError(f"No opening ( found for ) at token {i}")
+                j: int = opened.pop()
+                self.matches[i], self.matches[j] = j, i
+        if opened:
+            raise GroveParseError(f"No closing ) found for ( at token {opened[-1]}")
+    def peek(self) -> str:
+        """Returns the token at the cursor without moving past it"""
+        if self.pos >= len(self.tokens):
+            raise GroveParseError(f"Unexpected end of line at token {self.pos}")
+        return self.tokens[self.pos]
+    def advance(self) -> str:
+        """Returns the token at the cursor and moves past it"""
+        token: str = self.peek()
+        self.pos += 1
+        return token
+    def expect(self, token: str) -> None:
+        """Moves past the token at the cursor, which must be the given token"""
+        found: str = self.peek()
+        if found != token:
+            raise GroveParseError(f"Expected '{token}' but found '{found}' at token {self.pos}")
+        self.pos += 1
+    def open_group(self) -> int:
+        """Moves past the ( at the cursor and returns the index of its )"""
+        self.expect('(')
+        return self.matches[self.pos - 1]
+    def close_group(self, close: int) -> None:
+        """Moves past the ) at index close, which must be at the cursor"""
+        if self.pos != close:
+            raise GroveParseError(f"Expected ')' at token {self.pos} to close the ( at token {self.matches[close]}")
+        self.pos += 1
+    def parse_all(self, production: Callable[[Parser], Command]) -> Command:
+        """Parses the whole line as the given production"""
+        node: Command = production(self)
+        # every token must belong to the production
+        if self.pos != len(self.tokens):
+            raise GroveParseError(f"Unexpected '{self.tokens[self.pos]}' at token {self.pos}")
+        return node
+
+    def parse_command(self) -> Command:
+        """command: statement | expression"""
+        # statements all begin with a keyword, so the first token says
+        # whether to parse this command as a statement
+        if self.pos < len(self.tokens) and self.tokens[self.pos] in _STMT_KEYWORDS:
+            return self.parse_stmt()
+        return self.parse_expr()
+    def parse_stmt(self) -> Statement:
+        """statement: assignment | import | terminate"""
+        token: str = self.peek()
+        if token == 'set': return self.parse_assignment()
+        if token == 'import': return self.parse_import()
+        if token == 'quit' or token == 'exit': return self.parse_terminate()
+        raise GroveParseError(f"Unrecognized Command at token {self.pos}: {token}")
+    def parse_expr(self) -> Expression:
+        """expression: addition | object | call | string | number | name"""
+        # the first token alone decides which production to read
+        token: str = self.peek()
+        if token == '+': return self.parse_addition()
+        if token == 'new': return self.parse_object()
+        if token == 'call': return self.parse_call()
+        if token[0] == '"': return self.parse_string()
+        if token[0].isdigit(): return self.parse_number()
+        return self.parse_name()
+
+    def parse_assignment(self) -> Assignment:
+        """assignment: 'set' name '=' expression"""
+        self.expect('set')
+        name: str = self.parse_identifier()
+        self.expect('=')
+        return Assignment(name, self.parse_expr())
+    def parse_import(self) -> Import:
+        """import: 'import' dotted-name"""
+        self.expect('import')
+        return Import(self.advance())
+    def parse_terminate(self) -> Terminate:
+        """terminate: 'quit' | 'exit'"""
+        return Terminate(self.advance())
+    def parse_addition(self) -> Sum:
+        """addition: '+' '(' expression ')' '(' expression ')'"""
+        self.expect('+')
+        close: int = self.open_group()
+        first: Expression = self.parse_expr()
+        self.close_group(close)
+        close = self.open_group()
+        second: Expression = self.parse_expr()
+        self.close_group(close)
+        # a Sum on the left is added first anyway, so take over its addends
+        if isinstance(first, Sum):
+            return Sum(first.children + (second,))
+        return Sum((first, second))
+    def parse_object(self) -> Object:
+        """object: 'new' dotted-name"""
+        self.expect('new')
+        # the target is found when evaluated, but it must look like a name
+        return Object(self.parse_dotted())
+    def parse_call(self) -> Call:
+        """call: 'call' '(' name method argument* ')'"""
+        self.expect('call')
+        close: int = self.open_group()
+        ref: Name = self.parse_name()
+        method: str = self.advance()
+        args: list[Expression] = []
+        # the arguments are every expression before the ) of the call
+        while self.pos < close:
+            if self.tokens[self.pos] == '(':
+                # an argument wrapped in () is the expression inside them
+                inner: int = self.open_group()
+                args.append(self.parse_expr())
+                self.close_group(inner)
+            else:
+                args.append(self.parse_expr())
+        self.close_group(close)
+        return Call(ref, method, tuple(args))
+    def parse_string(self) -> StringLiteral:
+        """string: a token wrapped in quotes"""
+        token: str = self.advance()
+        # a lone " is both the first and last character, so check the length
+        if len(token) < 2 or token[0] != '"' or token[-1] != '"':
+            raise GroveParseError("Needs quotes on the sides")
+        return StringLiteral(token[1:-1])
+    def parse_number(self) -> Number:
+        """number: a token of digits"""
+        token: str = self.advance()
+        if not _NUM_RE.fullmatch(token):
+            raise GroveParseError("Numbers can contain only digits")
+        return Number(int(token))
+    def parse_name(self) -> Name:
+        """name: a letter followed by letters, digits, or _"""
+        return Name(self.parse_identifier())
+    def parse_identifier(self) -> str:
+        """Reads the token of a name, without making a Name node of it"""
+        token: str = self.advance()
+        if not _NAME_RE.fullmatch(token):
+            raise GroveParseError("Names must start with a letter and contain only letters, digits, or _")
+        if token in _RESERVED:
+            raise GroveParseError(f"{token} is a protected word and not a valid name for your variable")
+        return token
+    def parse_dotted(self) -> str:
+        """dotted-name: names joined by '.', such as a module or a class in one"""
+        token: str = self.advance()
+        if not all(piece.isidentifier() for piece in token.split(".")):
+            raise GroveParseError(f"'{token}' is not a name of a module or class")
+        return token
+
+# the keywords that begin a statement
+_STMT_KEYWORDS = frozenset({'set', 'import', 'quit', 'exit'})
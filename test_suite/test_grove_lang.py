@@ -0,0 +1,61 @@
+from __future__ import annotations
+import unittest
+
+# identify the current directory of this script and add it to the path
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+
+# import all node types from the grove language
+import grove_lang
+from grove_lang import *
+
+class TestGroveLang(unittest.TestCase):
+
+    def test_nested_call(self):
+        # make sure a call given as an argument is parsed and evaluated
+        grove_lang.lst = []
+        Command.parse('set s = "foo"').eval()
+        Command.parse('call ( lst append call ( s find "o" ) )').eval()
+        self.assertEqual(grove_lang.lst, [1])
+
+    def test_reserved_names(self):
+        # make sure Grove keywords cannot be used as variable names
+        for word in ["set", "new", "import", "call", "quit", "exit"]:
+            with self.assertRaises(GroveParseError):
+                Command.parse(f"set {word} = 5")
+
+    def test_new_dotted(self):
+        # make sure new on module.Class makes an instance of the class
+        import calendar
+        Command.parse("import calendar").eval()
+        cal = Command.parse("new calendar.Calendar").eval()
+        self.assertIsInstance(cal, calendar.Calendar)
+
+    def test_new_each_eval(self):
+        # make sure every eval of a cached new makes a new instance
+        cmd: Command = Command.parse("new __builtins__.list")
+        self.assertIsNot(cmd.eval(), cmd.eval())
+        # make sure new on a single name is the object bound to that name
+        Command.parse("set a = 5").eval()
+        self.assertEqual(Command.parse("new a").eval(), 5)
+
+    def test_parse_is_silent(self):
+        # make sure parsing a call prints nothing, such as its argument tokens
+        import contextlib
+        import io
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            Command.parse('call ( lst append + ( 4 ) ( 7 ) "x" )')
+        self.assertEqual(out.getvalue(), "")
+
+    def test_string(self):
+        # make sure a quoted token parses to the string between the quotes
+        self.assertEqual(Command.parse('"hello"').eval(), "hello")
+        self.assertEqual(Command.parse('""').eval(), "")
+        # make sure a lone quote is not taken as an empty string
+        with self.assertRaises(GroveParseError):
+            Command.parse('"')
+
+if __name__ == '__main__':
+    unittest.main()